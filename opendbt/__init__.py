@@ -1,7 +1,10 @@
+import collections
+import functools
 import logging
 import os
 import sys
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 ######################
 from opendbt.dbt import patch_dbt
@@ -12,11 +15,58 @@ from opendbt.utils import Utils
 
 from dbt.cli.main import dbtRunner as DbtCliRunner
 from dbt.cli.main import dbtRunnerResult
+from dbt.cli.resolvers import default_profiles_dir
 from dbt.config import PartialProject
-from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.manifest import Manifest, WritableManifest
 from dbt.contracts.results import RunResult
 from dbt.exceptions import DbtRuntimeError
 from dbt.task.base import get_nearest_project_dir
+from dbt.version import __version__ as dbt_version
+
+# flags skipping work which is not needed for single node invocations
+FAST_SINGLE_NODE_ARGS = ["--no-populate-cache", "--no-write-json", "--no-send-anonymous-usage-stats"]
+FAST_SINGLE_NODE_COMMANDS = ["run", "test", "build"]
+
+# project source directories, `dbt_project.yml` key and its default value
+PROJECT_SOURCE_PATHS = {
+    'model-paths': 'models',
+    'macro-paths': 'macros',
+    'seed-paths': 'seeds',
+    'snapshot-paths': 'snapshots',
+    'test-paths': 'tests',
+    'analysis-paths': 'analyses',
+}
+
+# arguments changing the parsed manifest, cached manifest is reused only by invocations with the same values
+MANIFEST_KEY_ARGS = {"--target": "target", "-t": "target", "--profile": "profile", "--vars": "vars"}
+# commands which don't use cached manifest, `deps` and `clean` change the project packages, they invalidate it
+MANIFEST_REFRESH_COMMANDS = ["parse", "deps", "clean"]
+
+
+def _manifest_cache_key(args: list) -> tuple:
+    """
+    :return: tuple: `(target, profile, vars)` values given in the dbt arguments, `None` for the missing ones.
+    """
+    values = {}
+    for i, arg in enumerate(args):
+        name, _, value = arg.partition("=")
+        if name in MANIFEST_KEY_ARGS:
+            if not value and i + 1 < len(args):
+                value = args[i + 1]
+            values[MANIFEST_KEY_ARGS[name]] = value
+    return values.get("target"), values.get("profile"), values.get("vars")
+
+
+@functools.lru_cache(maxsize=32)
+def _load_project(project_dir: str) -> PartialProject:
+    # process wide cache of loaded projects, avoids re-reading `dbt_project.yml` for each new instance
+    return PartialProject.from_project_root(project_root=project_dir, verify_version=True)
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_project_dir(project_dir: str) -> str:
+    # project layout is not expected to change within the process, cache the filesystem lookup
+    return str(get_nearest_project_dir(project_dir))
 
 
 class OpenDbtLogger:
@@ -35,20 +85,28 @@ class OpenDbtLogger:
         return self._log
 
 
+# pylint: disable=too-many-instance-attributes
 class OpenDbtCli:
+    __slots__ = ('project_dir', 'profiles_dir', '_project_dir_str', '_profiles_dir_str', '_project', '_project_vars',
+                 '_user_callbacks', '_project_callbacks', '_manifest', '_manifest_key', '_runner')
 
     def __init__(self, project_dir: Path, profiles_dir: Path = None, callbacks: list = None):
-        self.project_dir: Path = Path(get_nearest_project_dir(project_dir.as_posix()))
+        self.project_dir: Path = Path(_resolve_project_dir(project_dir.as_posix()))
         self.profiles_dir: Path = profiles_dir
+        self._project_dir_str: str = self.project_dir.as_posix()
+        self._profiles_dir_str: Optional[str] = self.profiles_dir.as_posix() if self.profiles_dir else None
         self._project: PartialProject = None
+        self._project_vars: Optional[dict] = None
         self._user_callbacks = callbacks if callbacks else []
         self._project_callbacks = None
+        self._manifest: Optional[Manifest] = None
+        self._manifest_key: Optional[tuple] = None
+        self._runner: Optional[DbtCliRunner] = None
 
     @property
     def project(self) -> PartialProject:
         if not self._project:
-            self._project = PartialProject.from_project_root(project_root=self.project_dir.as_posix(),
-                                                             verify_version=True)
+            self._project = _load_project(self._project_dir_str)
 
         return self._project
 
@@ -64,40 +122,77 @@ class OpenDbtCli:
                     This method only retrieves global project variables specified within the `dbt_project.yml` file.
                     Variables passed via command-line arguments are not included in the returned dictionary.
         """
-        if 'vars' in self.project_dict:
-            return self.project_dict['vars']
+        if self._project_vars is None:
+            self._project_vars = self.project_dict.get('vars', {})
+
+        return self._project_vars
+
+    @property
+    def target_dir(self) -> Path:
+        return self.project_dir.joinpath(self.project_dict.get('target-path', 'target'))
 
-        return {}
+    def project_files_mtime(self) -> float:
+        """
+        :return: float: Latest modification time of the project files, changes to these files require re-parsing
+                the project.
+        """
+        latest = 0.0
+        for _file in ["dbt_project.yml", "packages.yml", "dependencies.yml", "selectors.yml"]:
+            _path = self.project_dir.joinpath(_file)
+            if _path.is_file():
+                latest = max(latest, _path.stat().st_mtime)
+        # same lookup as dbt, when profiles dir is not given
+        profiles_dir = self.profiles_dir if self.profiles_dir else Path(
+            os.environ.get("DBT_PROFILES_DIR", default_profiles_dir()))
+        if profiles_dir.joinpath("profiles.yml").is_file():
+            latest = max(latest, profiles_dir.joinpath("profiles.yml").stat().st_mtime)
+
+        for _paths_key, _default in PROJECT_SOURCE_PATHS.items():
+            for _path in self.project_dict.get(_paths_key, [_default]):
+                latest = max(latest, Utils.latest_mtime(self.project_dir.joinpath(_path).as_posix()))
+        # installed packages, updated by `dbt deps`
+        packages_dir = self.project_dir.joinpath(self.project_dict.get('packages-install-path', 'dbt_packages'))
+        return max(latest, Utils.latest_mtime(packages_dir.as_posix()))
 
     @property
     def project_callbacks(self):
-        if not self._project_callbacks:
-            self._project_callbacks = self._user_callbacks
-            if 'dbt_callbacks' in self.project_vars:
-                for _callback_module in str(self.project_vars['dbt_callbacks']).split(','):
-                    _project_callback = Utils.import_module_attribute_by_name(_callback_module)
-                    self._project_callbacks.append(_project_callback)
+        if self._project_callbacks is None:
+            # copy, to not modify user given callbacks list
+            _callbacks = list(self._user_callbacks)
+            _callback_modules = self.project_vars.get('dbt_callbacks')
+            if _callback_modules:
+                for _callback_module in _callback_modules.split(','):
+                    if _callback_module.strip():
+                        _callbacks.append(Utils.import_module_attribute_by_name(_callback_module.strip()))
+            self._project_callbacks = _callbacks
 
         return self._project_callbacks
 
-    def invoke(self, args: list, callbacks: list = None) -> dbtRunnerResult:
+    def invoke(self, args: list, callbacks: list = None, fast_single_node: bool = False) -> dbtRunnerResult:
         """
         Run dbt with the given arguments.
 
         :param args: The arguments to pass to dbt.
         :param callbacks:
+        :param fast_single_node: For `run`, `test` and `build` commands, skip relation cache population,
+                json artifacts writing and anonymous usage stats. Intended for per node invocations, the selection
+                is not checked, flags are applied to any `run`, `test` or `build` invocation. Flags explicitly
+                enabled in the arguments, ex: `--write-json`, are kept.
         :return: The result of the dbt run.
         """
         run_callbacks = self.project_callbacks + callbacks if callbacks else self.project_callbacks
-        run_args = args if args else []
+        # copy, to not modify user given args list
+        run_args = list(args) if args else []
+        if fast_single_node and run_args and run_args[0] in FAST_SINGLE_NODE_COMMANDS:
+            run_args.extend([arg for arg in FAST_SINGLE_NODE_ARGS
+                             if arg not in run_args and arg.replace("--no-", "--", 1) not in run_args])
         if "--project-dir" not in run_args:
-            run_args += ["--project-dir", self.project_dir.as_posix()]
-        if "--profiles-dir" not in run_args and self.profiles_dir:
-            run_args += ["--profiles-dir", self.profiles_dir.as_posix()]
+            run_args.extend(["--project-dir", self._project_dir_str])
+        if "--profiles-dir" not in run_args and self._profiles_dir_str:
+            run_args.extend(["--profiles-dir", self._profiles_dir_str])
         return self.run(args=run_args, callbacks=run_callbacks)
 
-    @staticmethod
-    def run(args: list, callbacks: list = None) -> dbtRunnerResult:
+    def run(self, args: list, callbacks: list = None) -> dbtRunnerResult:
         """
         Run dbt with the given arguments.
 
@@ -107,31 +202,73 @@ class OpenDbtCli:
         """
         callbacks = callbacks if callbacks else []
         # https://docs.getdbt.com/reference/programmatic-invocations
-        dbtcr = DbtCliRunner(callbacks=callbacks)
-        result: dbtRunnerResult = dbtcr.invoke(args)
+        # already parsed manifest is reused only when it's parsed with the same target, profile and vars,
+        # `parse` command always parses the project
+        command = args[0] if args else None
+        manifest_key = _manifest_cache_key(args)
+        manifest = None
+        if command not in MANIFEST_REFRESH_COMMANDS and manifest_key == self._manifest_key:
+            manifest = self._manifest
+        # single runner is kept for the lifetime of this instance, callbacks and manifest are refreshed on it
+        # before each invocation
+        if self._runner is None:
+            self._runner = DbtCliRunner(callbacks=callbacks, manifest=manifest)
+        else:
+            self._runner.callbacks = callbacks
+            self._runner.manifest = manifest
+        result: dbtRunnerResult = self._runner.invoke(args)
         if result.success:
+            if isinstance(result.result, Manifest):
+                self._manifest = result.result
+                self._manifest_key = manifest_key
+            elif command in MANIFEST_REFRESH_COMMANDS:
+                # installed packages changed, project needs to be parsed again
+                self.invalidate_manifest()
             return result
 
         if result.exception:
             raise result.exception
 
-        # take error message and raise it as exception
-        for _result in result.result:
-            _result: RunResult
-            _result_messages = ""
-            if _result.status == 'error':
-                _result_messages += f"{_result_messages}\n"
-            if _result_messages:
-                raise DbtRuntimeError(msg=_result.message)
+        # take error messages and raise them as exception, prefixed with node status summary
+        status_counts = collections.Counter(_result.status for _result in result.result)
+        errors = [_result.message for _result in result.result if _result.status == 'error']
+        if errors:
+            status_summary = ", ".join(f"{status}={count}" for status, count in status_counts.items())
+            raise DbtRuntimeError(msg=f"{status_summary}: " + "\n".join(errors))
 
-        raise DbtRuntimeError(msg=f"DBT execution failed!")
+        raise DbtRuntimeError(msg="DBT execution failed!")
 
-    def manifest(self, partial_parse=True, no_write_manifest=True) -> Manifest:
+    def manifest(self, partial_parse=True, no_write_manifest=True, target: str = None,
+                 from_manifest_file=False) -> Manifest:
+        """
+        :param partial_parse: Parse the project using dbt partial parsing.
+        :param no_write_manifest: Don't write json artifacts when parsing the project.
+        :param target: dbt target to parse the project for.
+        :param from_manifest_file: Load existing `manifest.json` instead of parsing, when it's newer than all the
+                project files. The file is not validated against the target, vars or environment variables, it
+                should be written for the same ones, ex: by `dbt parse --target <target>`. Manifest loaded from the
+                file is incomplete (no parsed files, parent map, etc.), it's only returned and never cached or
+                reused by the following invocations. Requires dbt 1.8 or later, on older versions the project is
+                parsed.
+        :return: Manifest: Parsed project manifest.
+        """
         args = ["parse"]
+        if target:
+            args += ["--target", target]
+        if self._manifest is not None and self._manifest_key == _manifest_cache_key(args):
+            return self._manifest
+
+        if from_manifest_file:
+            manifest = self._load_json_manifest(files_mtime=self.project_files_mtime())
+            if manifest is not None:
+                return manifest
+
         if partial_parse:
             args += ["--partial-parse"]
         if no_write_manifest:
             args += ["--no-write-json"]
+        # only parsing, relation cache and usage stats are not needed
+        args += ["--no-populate-cache", "--no-send-anonymous-usage-stats"]
 
         result = self.invoke(args=args)
         if isinstance(result.result, Manifest):
@@ -139,6 +276,45 @@ class OpenDbtCli:
 
         raise Exception(f"DBT execution did not return Manifest object. returned:{type(result.result)}")
 
+    def _load_json_manifest(self, files_mtime: float) -> Optional[Manifest]:
+        """
+        Load manifest from `manifest.json` artifact, when it's up-to-date with the project files.
+
+        :param files_mtime: Latest modification time of the project files.
+        :return: Manifest: Loaded manifest, `None` when the file is missing, stale or written by another dbt version,
+                or when the dbt version doesn't support loading the manifest from artifact.
+        """
+        if not hasattr(Manifest, 'from_writable_manifest'):
+            # added in dbt 1.8
+            return None
+
+        json_file = self.target_dir.joinpath("manifest.json")
+        if not json_file.is_file() or json_file.stat().st_mtime <= files_mtime:
+            return None
+
+        manifest_dict = Utils.json_loads(json_file.read_bytes())
+        if manifest_dict.get('metadata', {}).get('dbt_version') != dbt_version:
+            return None
+        manifest = Manifest.from_writable_manifest(WritableManifest.from_dict(manifest_dict))
+        manifest.build_flat_graph()
+        return manifest
+
+    def invalidate_manifest(self):
+        """
+        Drop the cached manifest, next invocation re-parses the project.
+        """
+        self._manifest = None
+        self._manifest_key = None
+
+    def invalidate_project(self):
+        """
+        Drop the cached projects, next access re-reads `dbt_project.yml`, ex: after the file is changed.
+        """
+        _load_project.cache_clear()
+        self._project = None
+        self._project_vars = None
+        self._project_callbacks = None
+
     def generate_docs(self, args: list = None):
         _args = ["docs", "generate"] + args if args else []
         self.invoke(args=_args)
@@ -149,12 +325,15 @@ class OpenDbtProject(OpenDbtLogger):
     This class is used to take action on a dbt project.
     """
 
+    __slots__ = ('project_dir', 'profiles_dir', '_project_dir_str', '_profiles_dir_str', 'target', 'args', 'cli')
     DEFAULT_TARGET = 'dev'  # development
 
     def __init__(self, project_dir: Path, target: str = None, profiles_dir: Path = None, args: list = None):
         super().__init__()
         self.project_dir: Path = project_dir
         self.profiles_dir: Path = profiles_dir
+        self._project_dir_str: str = self.project_dir.as_posix()
+        self._profiles_dir_str: Optional[str] = self.profiles_dir.as_posix() if self.profiles_dir else None
         self.target: str = target if target else self.DEFAULT_TARGET
         self.args = args if args else []
         self.cli: OpenDbtCli = OpenDbtCli(project_dir=self.project_dir, profiles_dir=self.profiles_dir)
@@ -172,18 +351,33 @@ class OpenDbtProject(OpenDbtLogger):
         return self.cli.project_vars
 
     def run(self, command: str = "build", target: str = None, args: list = None, use_subprocess: bool = False,
-            write_json: bool = False) -> dbtRunnerResult:
-
-        run_args = args if args else []
-        run_args += ["--target", target if target else self.target]
-        run_args += ["--project-dir", self.project_dir.as_posix()]
-        if self.profiles_dir:
-            run_args += ["--profiles-dir", self.profiles_dir.as_posix()]
-        run_args = [command] + run_args + self.args
+            write_json: bool = False, fast_single_node: bool = False) -> dbtRunnerResult:
+        """
+        Run dbt command on the project.
+
+        :param command: dbt command to run, ex: `build`, `run`, `test`.
+        :param target: dbt target to use, defaults to project target.
+        :param args: Additional arguments to pass to dbt.
+        :param use_subprocess: Run dbt in a separate `python -m opendbt` process. Each subprocess pays the full
+                python and dbt startup cost (imports, project/profile loading, manifest parsing, adapter
+                registration). Use it only when process isolation is needed. By default dbt is invoked
+                programmatically, in-process, which reuses the cached manifest and the dbt runner.
+        :param write_json: Write dbt json artifacts, replaces `--no-write-json` argument with `--write-json`.
+        :param fast_single_node: Skip work not needed for single node runs, see `OpenDbtCli.invoke`.
+        :return: The result of the dbt run, `None` when subprocess is used.
+        """
+        run_args = [command, *(args if args else []),
+                    "--target", target if target else self.target,
+                    "--project-dir", self._project_dir_str]
+        if self._profiles_dir_str:
+            run_args.extend(["--profiles-dir", self._profiles_dir_str])
+        run_args.extend(self.args)
         if write_json:
-            run_args.remove("--no-write-json")
+            run_args = [arg for arg in run_args if arg != "--no-write-json"]
+            run_args.append("--write-json")
 
         if use_subprocess:
+            self.log.info("Running dbt in subprocess, it pays full dbt startup cost on each run.")
             shell = False
             self.log.info(f"Working dir: {os.getcwd()}")
             py_executable = sys.executable if sys.executable else 'python'
@@ -194,10 +388,58 @@ class OpenDbtProject(OpenDbtLogger):
             return None
 
         self.log.info(f"Running `dbt {' '.join(run_args)}`")
-        return self.cli.invoke(args=run_args)
+        return self.cli.invoke(args=run_args, fast_single_node=fast_single_node)
+
+    def run_nodes(self, nodes: list, threads: int = 8, command: str = "run", target: str = None,
+                  args: list = None) -> dbtRunnerResult:
+        """
+        Run given nodes concurrently, within single dbt invocation.
+
+        dbt does not support concurrent invocations within the same process, instead nodes are selected together
+        and executed by dbt's own thread pool (`--threads`), sharing the single adapter instance.
+
+        :param nodes: Names of the nodes to run.
+        :param threads: Number of threads dbt uses to execute the nodes.
+        :param command: dbt command to run, ex: `run`, `build`, `test`.
+        :param target: dbt target to use, defaults to project target.
+        :param args: Additional arguments to pass to dbt.
+        :return: The result of the dbt run.
+        """
+        if not nodes:
+            raise ValueError("At least one node should be provided!")
+
+        run_args = ["--select", *nodes, "--threads", str(threads)]
+        if args:
+            run_args.extend(args)
+        return self.run(command=command, target=target, args=run_args)
+
+    def run_pipeline(self, steps: List[Tuple[str, list]], target: str = None) -> List[dbtRunnerResult]:
+        """
+        Run multiple dbt commands sequentially, all steps share the same dbt runner. Steps reuse the manifest
+        cached by `manifest()` when they run with the same target and vars, otherwise each step parses the project.
+        `deps` and `clean` steps invalidate the cached manifest, following steps parse the project again.
+
+        Note: prefer single `build` step over separate `seed`, `run` and `test` steps, it executes them in one
+        invocation.
+
+        :param steps: List of `(command, args)` tuples, ex: `[("deps", []), ("build", ["--select", "tag:daily"])]`.
+        :param target: dbt target to use, defaults to project target.
+        :return: Results of the executed steps, in the given order.
+        """
+        results = []
+        for command, args in steps:
+            results.append(self.run(command=command, target=target, args=args))
+        return results
+
+    def manifest(self, partial_parse=True, no_write_manifest=True, from_manifest_file=False) -> Manifest:
+        return self.cli.manifest(partial_parse=partial_parse, no_write_manifest=no_write_manifest,
+                                 target=self.target, from_manifest_file=from_manifest_file)
+
+    def invalidate_manifest(self):
+        return self.cli.invalidate_manifest()
 
-    def manifest(self, partial_parse=True, no_write_manifest=True) -> Manifest:
-        return self.cli.manifest(partial_parse=partial_parse, no_write_manifest=no_write_manifest)
+    def invalidate_project(self):
+        return self.cli.invalidate_project()
 
     def generate_docs(self, args: list = None):
         return self.cli.generate_docs(args=args)
@@ -2,11 +2,18 @@ import dbt
 from dbt import version
 from packaging.version import Version
 
+_PATCHED = False
+
 
 def patch_dbt():
     # ================================================================================================================
     # Monkey Patching! Override dbt lib code with new one
     # ================================================================================================================
+    # patches are applied once per interpreter, re-applying would replace already patched objects, ex: FACTORY
+    global _PATCHED
+    if _PATCHED:
+        return
+
     dbt_version = Version(version.get_installed_version().to_version_string(skip_matcher=True))
     if Version("1.6.0") <= dbt_version < Version("1.8.0"):
         from opendbt.dbt.v17.config.runtime import OpenDbtRuntimeConfig
@@ -35,3 +42,4 @@ def patch_dbt():
     dbt.cli.main.sqlfluff = opendbt.dbt.shared.cli.main.sqlfluff
     dbt.cli.main.sqlfluff_lint = opendbt.dbt.shared.cli.main.sqlfluff_lint
     dbt.cli.main.sqlfluff_fix = opendbt.dbt.shared.cli.main.sqlfluff_fix
+    _PATCHED = True
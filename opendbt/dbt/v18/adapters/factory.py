@@ -1,3 +1,4 @@
+import functools
 import importlib
 from multiprocessing.context import SpawnContext
 from typing import Optional
@@ -48,22 +49,28 @@ class OpenDbtAdapterContainer(factory.AdapterContainer):
             if custom_adapter_class_name and custom_adapter_class_name.strip():
                 return custom_adapter_class_name
         # SECOND: it's set inside dbt_project.yml
-        if hasattr(config, 'vars') and self.DBT_CUSTOM_ADAPTER_VAR in config.vars.to_dict():
-            custom_adapter_class_name: str = config.vars.to_dict()[self.DBT_CUSTOM_ADAPTER_VAR]
+        vars_dict = config.vars.to_dict() if hasattr(config, 'vars') else None
+        if vars_dict and self.DBT_CUSTOM_ADAPTER_VAR in vars_dict:
+            custom_adapter_class_name: str = vars_dict[self.DBT_CUSTOM_ADAPTER_VAR]
             if custom_adapter_class_name and custom_adapter_class_name.strip():
                 return custom_adapter_class_name
 
         return None
 
     def get_custom_adapter_class_by_name(self, custom_adapter_class_name: str):
-        if "." not in custom_adapter_class_name:
-            raise ValueError(f"Unexpected adapter class name: `{custom_adapter_class_name}` ,"
-                             f"Expecting something like:`my.sample.library.MyAdapterClass`")
+        return get_custom_adapter_class_by_name(custom_adapter_class_name)
 
-        __module, __class = custom_adapter_class_name.rsplit('.', 1)
-        try:
-            user_adapter_module = importlib.import_module(__module)
-            user_adapter_class = getattr(user_adapter_module, __class)
-            return user_adapter_class
-        except ModuleNotFoundError as mnfe:
-            raise Exception(f"Module of provided adapter not found, provided: {custom_adapter_class_name}") from mnfe
+
+@functools.lru_cache(maxsize=None)
+def get_custom_adapter_class_by_name(custom_adapter_class_name: str):
+    if "." not in custom_adapter_class_name:
+        raise ValueError(f"Unexpected adapter class name: `{custom_adapter_class_name}` ,"
+                         f"Expecting something like:`my.sample.library.MyAdapterClass`")
+
+    __module, __class = custom_adapter_class_name.rsplit('.', 1)
+    try:
+        user_adapter_module = importlib.import_module(__module)
+        user_adapter_class = getattr(user_adapter_module, __class)
+        return user_adapter_class
+    except ModuleNotFoundError as mnfe:
+        raise Exception(f"Module of provided adapter not found, provided: {custom_adapter_class_name}") from mnfe
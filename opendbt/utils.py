@@ -1,6 +1,14 @@
+import functools
 import importlib
+import json
+import os
 import subprocess
 
+try:
+    import orjson
+except ImportError:  # optional dependency, fallback to stdlib json
+    orjson = None
+
 
 class Utils:
 
@@ -16,6 +24,46 @@ class Utils:
             raise subprocess.CalledProcessError(p.returncode, p.args)
 
     @staticmethod
+    def json_loads(data: bytes):
+        """
+        Deserialize json, using `orjson` when it's installed, it's considerably faster on large files like manifest.
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    @staticmethod
+    def latest_mtime(path: str, _visited: set = None) -> float:
+        """
+        :return: float: Latest modification time of the given directory and all of its content, `0.0` when
+                path doesn't exist. Symlinks are followed, ex: `local` packages installed by `dbt deps`.
+        """
+        visited = _visited if _visited is not None else set()
+        try:
+            real_path = os.path.realpath(path)
+            if real_path in visited:
+                # symlink cycle, or directory already scanned
+                return 0.0
+            visited.add(real_path)
+            latest = os.stat(path).st_mtime
+            entries = os.scandir(path)
+        except OSError:
+            return 0.0
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    latest = max(latest, Utils.latest_mtime(entry.path, visited))
+                    continue
+                try:
+                    latest = max(latest, entry.stat().st_mtime)
+                except OSError:
+                    # dangling symlink, removed while scanning or not accessible
+                    continue
+        return latest
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
     def import_module_attribute_by_name(module_name: str):
         if "." not in module_name:
             raise ValueError(f"Unexpected module name: `{module_name}` ,"
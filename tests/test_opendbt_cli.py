@@ -1,4 +1,5 @@
 from dbt.exceptions import DbtRuntimeError
+from packaging.version import Version
 
 from base_dbt_test import BaseDbtTest
 from opendbt import OpenDbtProject, OpenDbtCli
@@ -13,6 +14,8 @@ class TestOpenDbtCli(BaseDbtTest):
             dp.run(command="run", args=['--select', '+my_failing_dbt_model'])
 
         self.assertIn('Referenced column "non_exists_column" not found in FROM clause', str(context.exception.msg))
+        # error message is prefixed with node status summary
+        self.assertRegex(str(context.exception.msg), r"^(success=1, error=1|error=1, success=1): ")
 
     def test_cli_attributes(self):
         dp = OpenDbtCli(project_dir=self.DBTCORE_DIR)
@@ -43,3 +46,44 @@ class TestOpenDbtCli(BaseDbtTest):
         dpc = OpenDbtCli(project_dir=self.DBTCORE_DIR)
         dpf.invoke(args=['run', '--select', 'my_cross_project_ref_model', "--profiles-dir", dpf.project_dir.as_posix()])
         dpc.invoke(args=['run', '--select', 'my_core_table1', "--profiles-dir", dpc.project_dir.as_posix()])
+
+    def test_cli_manifest_cached(self):
+        dp = OpenDbtCli(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        manifest = dp.manifest()
+        self.assertIs(manifest, dp.manifest())
+        dp.invalidate_manifest()
+        self.assertIsNot(manifest, dp.manifest())
+
+    def test_cli_manifest_cached_per_target(self):
+        dp = OpenDbtCli(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        dev_manifest = dp.manifest(target="dev")
+        prod_manifest = dp.manifest(target="prod")
+        self.assertIsNot(dev_manifest, prod_manifest)
+        self.assertIs(prod_manifest, dp.manifest(target="prod"))
+        # parse command always parses the project
+        result = dp.invoke(args=["parse", "--target", "prod"])
+        self.assertIsNot(prod_manifest, result.result)
+
+    def test_cli_manifest_invalidated_by_deps(self):
+        dp = OpenDbtCli(project_dir=self.DBTFINANCE_DIR, profiles_dir=self.DBTFINANCE_DIR)
+        manifest = dp.manifest()
+        dp.invoke(args=["deps"])
+        self.assertIsNot(manifest, dp.manifest())
+
+    def test_cli_manifest_from_json(self):
+        if Version(self.DBT_VERSION.to_version_string(skip_matcher=True)) < Version("1.8.0"):
+            self.skipTest("Loading manifest from manifest.json requires dbt 1.8 or later")
+        OpenDbtCli(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR).invoke(args=["parse"])
+        dp = OpenDbtCli(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        manifest = dp.manifest(from_manifest_file=True)
+        self.assertIn('model.dbtcore.my_first_dbt_model', manifest.nodes)
+        # loaded manifest is not cached, following calls parse the project
+        self.assertIsNot(manifest, dp.manifest())
+
+    def test_cli_project_cached(self):
+        dp1 = OpenDbtCli(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        dp2 = OpenDbtCli(project_dir=self.DBTCORE_DIR)
+        self.assertIs(dp1.project, dp2.project)
+        project = dp1.project
+        dp1.invalidate_project()
+        self.assertIsNot(project, dp1.project)
@@ -12,6 +12,43 @@ class TestOpenDbtProject(BaseDbtTest):
         dp.run(command="run", args=['--select', 'my_first_dbt_model+', "--exclude", "my_failing_dbt_model"],
                use_subprocess=True)
 
+    def test_run_nodes(self):
+        dp = OpenDbtProject(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        result = dp.run_nodes(nodes=['my_first_dbt_model', 'my_core_table1'], threads=2)
+        self.assertEqual(len(result.result), 2)
+
+    def test_run_pipeline(self):
+        dp = OpenDbtProject(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        results = dp.run_pipeline(steps=[("compile", []), ("run", ['--select', 'my_core_table1'])])
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(result.success for result in results))
+
+    def test_run_pipeline_deps_refreshes_manifest(self):
+        dp = OpenDbtProject(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        dp.manifest()
+        # model added after the manifest is cached, visible to the steps only when the project is parsed again
+        new_model = self.DBTCORE_DIR.joinpath("models", "my_pipeline_dbt_model.sql")
+        new_model.write_text("select 1 as id")
+        try:
+            results = dp.run_pipeline(steps=[("deps", []), ("run", ['--select', 'my_pipeline_dbt_model'])])
+        finally:
+            new_model.unlink()
+        self.assertEqual(len(results[1].result), 1)
+
+    def test_run_write_json(self):
+        dp = OpenDbtProject(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        dp.run(command="compile", write_json=True)
+
+    def test_run_fast_single_node(self):
+        dp = OpenDbtProject(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
+        run_results = self.DBTCORE_DIR.joinpath("target", "run_results.json")
+        run_results.unlink(missing_ok=True)
+        dp.run(command="run", args=['--select', 'my_core_table1'], fast_single_node=True)
+        self.assertFalse(run_results.exists())
+        # explicitly requested json artifacts are written
+        dp.run(command="run", args=['--select', 'my_core_table1'], fast_single_node=True, write_json=True)
+        self.assertTrue(run_results.exists())
+
     def test_project_attributes(self):
         dp = OpenDbtProject(project_dir=self.DBTCORE_DIR, profiles_dir=self.DBTCORE_DIR)
         self.assertEqual(dp.project.project_name, "dbtcore")